@@ -6,17 +6,19 @@ Notion hosted pages are client-side rendered with React, so this script uses
 Selenium to render the JavaScript and extract the full HTML content.
 """
 
+import asyncio
 import os
 import time
-from typing import Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import unquote, urlparse
-from urllib.request import Request, urlopen
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 try:
     from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException
     from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service as ChromeService
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.support.ui import WebDriverWait
@@ -25,172 +27,373 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+try:
+    import aiohttp
 
-def download_notion_page(url: str, temp_dir: str) -> Tuple[str, str]:
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Elements that indicate a Notion page has rendered, checked in a single wait
+PAGE_LOADED_SELECTOR = ", ".join(
+    [
+        "article",
+        "div[data-block-id]",  # Notion block
+        ".notion-page-content",
+        ".notion-app-inner",
+    ]
+)
+
+# Seconds the Notion block count must stay unchanged to consider rendering done
+DOM_STABLE_INTERVAL = 0.2
+
+# Asset URLs the browser doesn't need to fetch for rendering. Patterns match
+# the whole URL, so the trailing * also covers signed query strings.
+BLOCKED_URL_PATTERNS = [
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.mp3*",
+    "*.wav*",
+    "*.ogg*",
+    "*.m4a*",
+    "*.woff*",
+]
+
+# Bytes read from the network per write when downloading media
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Seconds idle connections to the Notion CDN are kept open for reuse
+KEEPALIVE_TIMEOUT = 30
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+
+def _resolve_asset_url(src: Optional[str], page_url: str) -> Optional[str]:
     """
-    Download a Notion hosted page and save it as HTML.
+    Resolve a media src attribute to an absolute URL.
 
-    Notion hosted pages are client-side rendered with React, so we need
-    Selenium to render the JavaScript and get the full HTML content.
+    Args:
+        src: Value of the src attribute
+        page_url: URL of the page the media belongs to
+
+    Returns:
+        Absolute URL, or None if the src cannot be downloaded
+    """
+    if not src:
+        return None
+
+    # Handle relative URLs
+    if src.startswith("http"):
+        return src
+    if src.startswith("//"):
+        return "https:" + src
+    if src.startswith("/"):
+        parsed_url = urlparse(page_url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}{src}"
+    return None
+
+
+async def _download_asset(
+    session: "aiohttp.ClientSession",
+    semaphore: asyncio.Semaphore,
+    src: str,
+    local_path: str,
+) -> None:
+    """Download a single media file to local_path."""
+    async with semaphore:
+        async with session.get(src) as response:
+            response.raise_for_status()
+            # Stream to disk so large files are never held in memory
+            with open(local_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+
+async def _download_assets(
+    urls_and_paths: List[Tuple[str, str]],
+    headers: Dict[str, str],
+    max_concurrent: int = 8,
+) -> List[Optional[BaseException]]:
+    """
+    Download media files concurrently using a single HTTP session.
 
     Args:
-        url: URL of the Notion hosted page
-        temp_dir: Temporary directory to save files
+        urls_and_paths: List of (url, local_path) pairs
+        headers: HTTP headers sent with every request
+        max_concurrent: Maximum number of simultaneous downloads
 
     Returns:
-        Tuple of (html_file_path, assets_dir_path)
+        List with None for each successful download or the raised exception,
+        in the same order as urls_and_paths
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    # Keep one pooled connection per concurrent download alive across assets
+    # from the same host, and resolve each host only once per session
+    connector = aiohttp.TCPConnector(
+        limit=max_concurrent,
+        limit_per_host=max_concurrent,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=None,
+    )
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        return await asyncio.gather(
+            *(
+                _download_asset(session, semaphore, src, local_path)
+                for src, local_path in urls_and_paths
+            ),
+            return_exceptions=True,
+        )
 
-    Raises:
-        RuntimeError: If Selenium is not available or rendering fails
+
+def _dom_stable(driver: "webdriver.Chrome") -> bool:
     """
-    print(f"🌐 Downloading Notion page from: {url}")
+    Wait condition that holds once the document has been parsed and the
+    number of Notion blocks stays the same over a short interval.
+    """
+    if driver.execute_script("return document.readyState") == "loading":
+        return False
 
-    if not SELENIUM_AVAILABLE:
-        raise RuntimeError(
-            "Selenium is required to download Notion hosted pages.\n"
-            "Install it with: pip install selenium\n"
-            "You also need Chrome/Chromium browser installed."
-        )
+    block_count = len(driver.find_elements(By.CSS_SELECTOR, "[data-block-id]"))
+    time.sleep(DOM_STABLE_INTERVAL)
+    return block_count == len(driver.find_elements(By.CSS_SELECTOR, "[data-block-id]"))
 
-    # Set up Chrome options for headless browsing
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    )
 
-    try:
-        # Initialize the Chrome driver
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
-
-        # Wait for the page to load - try multiple selectors
-        print("  ⏳ Waiting for page to render...")
-
-        # Try waiting for different elements that indicate page is loaded
-        loaded = False
-        wait_conditions = [
-            (By.TAG_NAME, "article"),
-            (By.CSS_SELECTOR, "div[data-block-id]"),  # Notion block
-            (By.CLASS_NAME, "notion-page-content"),
-            (By.CSS_SELECTOR, ".notion-app-inner"),
-        ]
-
-        for by, selector in wait_conditions:
+class NotionRenderer:
+    """
+    Renders Notion hosted pages with a reusable headless Chrome session.
+
+    Chrome is started lazily on the first render and kept alive until
+    close() is called, so converting several pages only pays the browser
+    startup cost once. Cookies are cleared between pages to keep them
+    isolated.
+    """
+
+    def __init__(self):
+        if not SELENIUM_AVAILABLE:
+            raise RuntimeError(
+                "Selenium is required to download Notion hosted pages.\n"
+                "Install it with: pip install selenium\n"
+                "You also need Chrome/Chromium browser installed."
+            )
+
+        self._driver = None
+
+    def __enter__(self) -> "NotionRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _get_driver(self) -> "webdriver.Chrome":
+        """Start Chrome on first use and return the shared driver."""
+        if self._driver is None:
+            # Set up Chrome options for headless browsing
+            chrome_options = Options()
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+            # Skip browser subsystems that aren't needed for rendering
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--disable-sync")
+            chrome_options.add_argument("--disable-default-apps")
+            chrome_options.add_argument("--no-first-run")
+            chrome_options.add_argument("--disable-features=TranslateUI")
+            chrome_options.add_argument("--mute-audio")
+
+            # Return from driver.get() once the DOM is ready instead of
+            # waiting for every third-party request to finish
+            chrome_options.page_load_strategy = "eager"
+
+            # Media is downloaded separately, so don't load it in the browser
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+
+            self._driver = webdriver.Chrome(
+                service=ChromeService(), options=chrome_options
+            )
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self._driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+            )
+
+        return self._driver
+
+    def render(self, url: str) -> str:
+        """
+        Load a Notion hosted page and return its rendered HTML.
+
+        Args:
+            url: URL of the Notion hosted page
+
+        Returns:
+            Fully rendered HTML of the page
+
+        Raises:
+            RuntimeError: If rendering fails
+        """
+        try:
+            driver = self._get_driver()
+            driver.get(url)
+
+            # Wait for any element that indicates the page is loaded
+            print("  ⏳ Waiting for page to render...")
+
             try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((by, selector))
+                element = WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, PAGE_LOADED_SELECTOR)
+                    )
                 )
-                loaded = True
-                print(f"  ✓ Found element: {selector}")
-                break
-            except:
-                continue
-
-        if not loaded:
-            # Fallback: just wait for body to be present and give it time
-            print("  ⚠️  Standard selectors not found, using fallback wait...")
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+                print(f"  ✓ Found element: {element.tag_name}")
+            except TimeoutException:
+                # Fallback: driver.get() already waited for the DOM to be ready
+                print("  ⚠️  Standard selectors not found, using page as is...")
+            else:
+                # Wait until dynamic content stops changing
+                try:
+                    WebDriverWait(driver, 5).until(_dom_stable)
+                except TimeoutException:
+                    print("  ⚠️  Page content still changing, continuing anyway...")
 
-        # Additional wait for dynamic content to load
-        time.sleep(3)
+            # Get the fully rendered HTML
+            html_content = driver.page_source
 
-        # Get the fully rendered HTML
-        html_content = driver.page_source
-        driver.quit()
+            # Don't leak session state into the next page
+            driver.delete_all_cookies()
 
-        print("  ✅ Page rendered successfully")
+            print("  ✅ Page rendered successfully")
+
+        except Exception as e:
+            # Start from a fresh browser on the next render
+            self.close()
+            raise RuntimeError(f"Failed to render page with Selenium: {e}")
+
+        return html_content
+
+    def close(self) -> None:
+        """Shut down the Chrome session if it was started."""
+        if self._driver is None:
+            return
 
-    except Exception as e:
         try:
-            driver.quit()
+            self._driver.quit()
         except:
             pass
-        raise RuntimeError(f"Failed to render page with Selenium: {e}")
+        self._driver = None
+
+
+def download_notion_page(
+    url: str, temp_dir: str, renderer: Optional[NotionRenderer] = None
+) -> Tuple[str, str]:
+    """
+    Download a Notion hosted page and save it as HTML.
+
+    Notion hosted pages are client-side rendered with React, so we need
+    Selenium to render the JavaScript and get the full HTML content.
+
+    Args:
+        url: URL of the Notion hosted page
+        temp_dir: Temporary directory to save files
+        renderer: Renderer to reuse across pages; a temporary one is
+            created and closed if not given
+
+    Returns:
+        Tuple of (html_file_path, assets_dir_path)
+
+    Raises:
+        RuntimeError: If Selenium or aiohttp is not available or rendering fails
+    """
+    print(f"🌐 Downloading Notion page from: {url}")
+
+    if not AIOHTTP_AVAILABLE:
+        raise RuntimeError(
+            "aiohttp is required to download media from Notion hosted pages.\n"
+            "Install it with: pip install aiohttp"
+        )
+
+    if renderer is None:
+        with NotionRenderer() as temp_renderer:
+            html_content = temp_renderer.render(url)
+    else:
+        html_content = renderer.render(url)
 
     # Create assets directory
     assets_dir = os.path.join(temp_dir, "assets")
     os.makedirs(assets_dir, exist_ok=True)
 
     # Parse HTML to download media files
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = BeautifulSoup(html_content, "lxml")
 
     # Create headers for downloads
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    # Download images
-    downloaded_count = 0
-    for img in soup.find_all("img"):
-        src = img.get("src")
-        if src:
-            # Handle relative URLs
-            if not src.startswith("http"):
-                if src.startswith("//"):
-                    src = "https:" + src
-                elif src.startswith("/"):
-                    parsed_url = urlparse(url)
-                    src = f"{parsed_url.scheme}://{parsed_url.netloc}{src}"
-                else:
-                    continue
-
-            try:
-                # Get filename from URL
-                parsed_url = urlparse(src)
-                filename = os.path.basename(unquote(parsed_url.path))
-                if not filename or filename == "/":
-                    filename = f"image_{downloaded_count}.png"
-
-                # Download file with headers
-                local_path = os.path.join(assets_dir, filename)
-                req = Request(src, headers=headers)
-                with urlopen(req) as response:
-                    with open(local_path, "wb") as f:
-                        f.write(response.read())
-
-                # Update src to local path
-                img["src"] = filename
-                downloaded_count += 1
-                print(f"  📥 Downloaded image: {filename}")
-            except Exception as e:
-                print(f"  ⚠️  Failed to download image {src}: {e}")
-
-    # Download audio files
-    for audio in soup.find_all("audio"):
-        src = audio.get("src")
-        if src:
-            if not src.startswith("http"):
-                if src.startswith("//"):
-                    src = "https:" + src
-                elif src.startswith("/"):
-                    parsed_url = urlparse(url)
-                    src = f"{parsed_url.scheme}://{parsed_url.netloc}{src}"
-                else:
-                    continue
+    headers = {"User-Agent": USER_AGENT}
+
+    # Collect images and audio files to download
+    tags_by_src: Dict[str, List[Tag]] = {}
+    filenames: Dict[str, str] = {}
+    used_filenames: Set[str] = set()
+    for index, tag in enumerate(soup.find_all(["img", "audio"])):
+        src = _resolve_asset_url(tag.get("src"), url)
+        if not src:
+            continue
+
+        # Download each distinct URL only once
+        tags_by_src.setdefault(src, []).append(tag)
+        if src in filenames:
+            continue
+
+        # Get filename from URL
+        filename = os.path.basename(unquote(urlparse(src).path))
+        if not filename or filename == "/":
+            if tag.name == "img":
+                filename = f"image_{index}.png"
+            else:
+                filename = f"audio_{index}.mp3"
+
+        # Different URLs often share a basename, keep their files apart
+        stem, ext = os.path.splitext(filename)
+        suffix = index
+        while filename in used_filenames:
+            filename = f"{stem}_{suffix}{ext}"
+            suffix += 1
+
+        filenames[src] = filename
+        used_filenames.add(filename)
+
+    # Download all files concurrently over a shared session
+    results = asyncio.run(
+        _download_assets(
+            [
+                (src, os.path.join(assets_dir, filename))
+                for src, filename in filenames.items()
+            ],
+            headers,
+        )
+    )
 
-            try:
-                parsed_url = urlparse(src)
-                filename = os.path.basename(unquote(parsed_url.path))
-                if not filename:
-                    filename = f"audio_{downloaded_count}.mp3"
-
-                local_path = os.path.join(assets_dir, filename)
-                req = Request(src, headers=headers)
-                with urlopen(req) as response:
-                    with open(local_path, "wb") as f:
-                        f.write(response.read())
-
-                audio["src"] = filename
-                downloaded_count += 1
-                print(f"  📥 Downloaded audio: {filename}")
-            except Exception as e:
-                print(f"  ⚠️  Failed to download audio {src}: {e}")
+    # Update src attributes to local paths
+    for (src, filename), error in zip(filenames.items(), results):
+        tags = tags_by_src[src]
+        kind = "image" if tags[0].name == "img" else "audio"
+        if error is not None:
+            print(f"  ⚠️  Failed to download {kind} {src}: {error}")
+            continue
+
+        for tag in tags:
+            tag["src"] = filename
+        print(f"  📥 Downloaded {kind}: {filename}")
 
     # Save modified HTML
     html_file = os.path.join(temp_dir, "notion_page.html")
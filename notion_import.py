@@ -8,19 +8,25 @@ Supports subdecks, media files (images, audio), and hashtag tagging.
 
 import argparse
 import csv
+import functools
+import hashlib
 import os
+import posixpath
 import re
 import shutil
 import tempfile
 import zipfile
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import unquote
 
 import genanki
 from bs4 import BeautifulSoup, NavigableString, Tag
 
 try:
-    from download_notion_page import download_notion_page
+    from download_notion_page import NotionRenderer, download_notion_page
 
     NOTION_DOWNLOAD_AVAILABLE = True
 except ImportError:
@@ -30,9 +36,21 @@ except ImportError:
 AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg", ".m4a")
 IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
 DEFAULT_SUBDECK_NAME = "Default"
+HASHTAG_RE = re.compile(r"#(\w+)")
+WHITESPACE_RE = re.compile(r"\s+")
+SKIP_TEXT_TAGS = frozenset({"script", "style"})
+# Below this many callouts, process startup costs more than it saves
+PARALLEL_MIN_CALLOUTS = 200
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB
 ANKI_MODEL_ID = 1607392319
 CARD_STYLE_CSS_FILE = os.path.join(os.path.dirname(__file__), "card_style.css")
-CARD_STYLE_CSS = open(CARD_STYLE_CSS_FILE, "r", encoding="utf-8").read()
+
+
+@functools.lru_cache(maxsize=None)
+def load_card_style_css() -> str:
+    """Read the custom card styling, cached after the first call."""
+    with open(CARD_STYLE_CSS_FILE, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 class NotionCard:
@@ -49,6 +67,28 @@ class NotionCard:
         return (self.front, self.back, self.tags, self.media_files)
 
 
+def iter_visible_strings(element: Tag) -> Iterator[NavigableString]:
+    """
+    Iterate over the text nodes of an element in document order.
+
+    Script and style subtrees are skipped without visiting their children.
+    Yielded nodes may be replaced while iterating.
+
+    Args:
+        element: BeautifulSoup element to walk
+
+    Yields:
+        Text nodes outside of script and style tags
+    """
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, NavigableString):
+            yield node
+        elif node.name not in SKIP_TEXT_TAGS:
+            stack.extend(reversed(node.contents))
+
+
 def extract_hashtags(element: Tag, keep_tags: bool = True) -> Tuple[Tag, List[str]]:
     """
     Extract hashtags from visible text inside a BeautifulSoup element.
@@ -62,35 +102,58 @@ def extract_hashtags(element: Tag, keep_tags: bool = True) -> Tuple[Tag, List[st
     """
     tags = []
 
-    for text_node in element.find_all(string=True):
-        # Skip script and style tags
-        if text_node.parent.name in {"script", "style"}:
+    for text_node in iter_visible_strings(element):
+        # Most text nodes contain no hashtags at all
+        if "#" not in text_node:
             continue
 
         # Find all hashtags in this text node
-        found_tags = re.findall(r"#(\w+)", text_node)
+        found_tags = HASHTAG_RE.findall(text_node)
         tags.extend(tag.lower() for tag in found_tags)
 
         # Remove hashtags if requested
         if not keep_tags and found_tags:
-            cleaned_text = re.sub(r"#\w+", "", text_node)
-            cleaned_text = re.sub(r"\s+", " ", cleaned_text).strip()
+            cleaned_text = HASHTAG_RE.sub("", text_node)
+            cleaned_text = WHITESPACE_RE.sub(" ", cleaned_text).strip()
             text_node.replace_with(NavigableString(cleaned_text))
 
     return element, tags
 
 
-def process_images(element: Tag, assets_dir: str) -> List[str]:
+def list_asset_files(assets_dir: str) -> Set[str]:
+    """
+    List the files available in the assets directory.
+
+    Args:
+        assets_dir: Directory containing media assets
+
+    Returns:
+        Set of file names in the directory
+    """
+    try:
+        with os.scandir(assets_dir or ".") as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def process_images(
+    element: Tag, assets_dir: str, available_files: Optional[Set[str]] = None
+) -> List[str]:
     """
     Process images in HTML element, updating src paths and collecting media files.
 
     Args:
         element: BeautifulSoup element containing images
         assets_dir: Directory containing media assets
+        available_files: File names in assets_dir, listed if not given
 
     Returns:
         List of full paths to media files
     """
+    if available_files is None:
+        available_files = list_asset_files(assets_dir)
+
     media_files = []
 
     for img in element.find_all("img"):
@@ -103,7 +166,7 @@ def process_images(element: Tag, assets_dir: str) -> List[str]:
         filename = os.path.basename(decoded_src)
         full_path = os.path.join(assets_dir, filename)
 
-        if os.path.exists(full_path):
+        if filename in available_files:
             media_files.append(full_path)
             img["src"] = filename  # Update to relative path for Anki
         else:
@@ -112,17 +175,23 @@ def process_images(element: Tag, assets_dir: str) -> List[str]:
     return media_files
 
 
-def process_audio_files(element: Tag, assets_dir: str) -> List[str]:
+def process_audio_files(
+    element: Tag, assets_dir: str, available_files: Optional[Set[str]] = None
+) -> List[str]:
     """
     Process audio file links, converting them to Anki sound format.
 
     Args:
         element: BeautifulSoup element containing audio links
         assets_dir: Directory containing media assets
+        available_files: File names in assets_dir, listed if not given
 
     Returns:
         List of full paths to audio files
     """
+    if available_files is None:
+        available_files = list_asset_files(assets_dir)
+
     media_files = []
 
     for link in element.find_all("a"):
@@ -133,7 +202,7 @@ def process_audio_files(element: Tag, assets_dir: str) -> List[str]:
         filename = os.path.basename(href)
         full_path = os.path.join(assets_dir, filename)
 
-        if os.path.exists(full_path):
+        if filename in available_files:
             media_files.append(full_path)
             # Replace link with Anki sound format
             sound_span = element.new_tag("span")
@@ -143,24 +212,28 @@ def process_audio_files(element: Tag, assets_dir: str) -> List[str]:
     return media_files
 
 
-def process_media_in_html(element: Tag, assets_dir: str) -> Tuple[str, List[str]]:
+def process_media_in_html(
+    element: Tag, assets_dir: str, available_files: Optional[Set[str]] = None
+) -> Tuple[str, List[str]]:
     """
     Process all media (images, audio) in HTML element.
 
     Args:
         element: BeautifulSoup element to process
         assets_dir: Directory containing media assets
+        available_files: File names in assets_dir, listed if not given
 
     Returns:
         Tuple of (HTML string, list of media file paths)
     """
     media_files = []
 
-    # Process images
-    media_files.extend(process_images(element, assets_dir))
+    # Process images, most callouts contain only text
+    if element.find("img") is not None:
+        media_files.extend(process_images(element, assets_dir, available_files))
 
     # Process audio files (currently commented out in original)
-    # media_files.extend(process_audio_files(element, assets_dir))
+    # media_files.extend(process_audio_files(element, assets_dir, available_files))
 
     return str(element), media_files
 
@@ -169,7 +242,8 @@ def extract_zip_file(zip_path: str, temp_dir: str) -> Tuple[str, str]:
     """
     Extract a ZIP file and locate the HTML file and assets directory.
 
-    Handles nested ZIP files (ZIP within ZIP).
+    Handles nested ZIP files (ZIP within ZIP), including exports split into
+    several parts. Only the HTML file and the files next to it are extracted.
 
     Args:
         zip_path: Path to the ZIP file
@@ -181,64 +255,87 @@ def extract_zip_file(zip_path: str, temp_dir: str) -> Tuple[str, str]:
     Raises:
         FileNotFoundError: If no HTML file is found in the ZIP
     """
-    # Extract main ZIP
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(temp_dir)
+        # Check for nested ZIPs
+        inner_zips = [
+            name
+            for name in zip_ref.namelist()
+            if name.endswith(".zip") and "/" not in name
+        ]
 
-    # Check for nested ZIPs
-    inner_zips = [f for f in os.listdir(temp_dir) if f.endswith(".zip")]
+        # Unpack the parts to disk so only one is open at a time
+        archive_paths = [zip_ref.extract(name, temp_dir) for name in inner_zips]
 
     if inner_zips:
-        inner_extract_dir = os.path.join(temp_dir, "extracted")
-        os.makedirs(inner_extract_dir, exist_ok=True)
-
-        for inner_zip in inner_zips:
-            inner_zip_path = os.path.join(temp_dir, inner_zip)
-            with zipfile.ZipFile(inner_zip_path, "r") as zip_ref:
-                zip_ref.extractall(inner_extract_dir)
-
-        work_dir = inner_extract_dir
+        extract_dir = os.path.join(temp_dir, "extracted")
     else:
-        work_dir = temp_dir
+        archive_paths = [zip_path]
+        extract_dir = temp_dir
 
     # Find HTML file
     html_files = []
-    for root, _, files in os.walk(work_dir):
-        for file in files:
-            if file.endswith((".html", ".htm")):
-                html_files.append(os.path.join(root, file))
+    for archive_path in archive_paths:
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            html_files.extend(
+                name
+                for name in archive.namelist()
+                if name.endswith((".html", ".htm"))
+            )
 
     if not html_files:
         raise FileNotFoundError("No HTML file found in ZIP")
 
+    html_name = html_files[0]
     if len(html_files) > 1:
-        print(f"⚠️  Multiple HTML files found, using {os.path.basename(html_files[0])}")
+        print(f"⚠️  Multiple HTML files found, using {posixpath.basename(html_name)}")
+
+    # Extract the HTML file and the media stored next to it from every part
+    page_dir = posixpath.dirname(html_name)
+    for archive_path in archive_paths:
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            members = [
+                name
+                for name in archive.namelist()
+                if not name.endswith("/") and posixpath.dirname(name) == page_dir
+            ]
+            archive.extractall(extract_dir, members=members)
+
+    # The parts are no longer needed
+    if inner_zips:
+        for archive_path in archive_paths:
+            os.remove(archive_path)
 
-    html_file = html_files[0]
+    html_file = os.path.join(extract_dir, *html_name.split("/"))
     assets_dir = os.path.dirname(html_file)
 
     return html_file, assets_dir
 
 
-def extract_css_from_html(html_path: str) -> str:
+def extract_css_from_html(html: Union[str, BeautifulSoup]) -> str:
     """
     Extract CSS from the Notion HTML file.
 
     Args:
-        html_path: Path to the HTML file
+        html: Path to the HTML file or an already parsed document
 
     Returns:
         CSS content as a string
     """
-    with open(html_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+    if isinstance(html, BeautifulSoup):
+        soup = html
+    else:
+        with open(html, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f, "lxml")
 
     style_tag = soup.find("style")
     return style_tag.string if style_tag else ""
 
 
 def parse_callout(
-    callout: Tag, assets_dir: str, keep_tags: bool = True
+    callout: Tag,
+    assets_dir: str,
+    keep_tags: bool = True,
+    available_files: Optional[Set[str]] = None,
 ) -> Optional[NotionCard]:
     """
     Parse a single callout figure into a flashcard.
@@ -250,6 +347,7 @@ def parse_callout(
         callout: BeautifulSoup callout figure element
         assets_dir: Directory containing media assets
         keep_tags: Whether to keep hashtags in the text
+        available_files: File names in assets_dir, listed if not given
 
     Returns:
         NotionCard object or None if parsing fails
@@ -281,7 +379,9 @@ def parse_callout(
     first_element.extract()
 
     # Process remaining content as back HTML with media
-    back_html, media_files = process_media_in_html(first_div, assets_dir)
+    back_html, media_files = process_media_in_html(
+        first_div, assets_dir, available_files
+    )
 
     # Make tags unique and lowercase
     unique_tags = sorted(set(tag.lower() for tag in tags))
@@ -313,13 +413,13 @@ def parse_html_file(
         Tuple of (deck_name, subdecks_dict, css_string)
     """
     with open(html_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+        soup = BeautifulSoup(f, "lxml")
 
     subdecks: Dict[str, List[NotionCard]] = {}
     deck_name = "Notion Deck"
 
-    # Extract CSS
-    css = extract_css_from_html(html_path)
+    # Extract CSS from the already parsed document
+    css = extract_css_from_html(soup)
 
     # Find main article
     article = soup.find("article")
@@ -336,56 +436,209 @@ def parse_html_file(
     if not page_body:
         return deck_name, subdecks, css
 
-    # Process top-level elements
-    for element in page_body.find_all(["details", "figure"], recursive=False):
-        if element.name == "details":
-            _process_details_subdeck(element, subdecks, assets_dir, keep_tags)
-        elif element.name == "figure" and "callout" in element.get("class", []):
-            _process_standalone_callout(element, subdecks, assets_dir, keep_tags)
-
-    return deck_name, subdecks, css
+    # List media once instead of checking every file separately
+    available_files = list_asset_files(assets_dir)
 
+    # Parse callouts into cards, in parallel for large pages
+    callouts = _collect_callouts(page_body, subdecks)
+    if len(callouts) >= PARALLEL_MIN_CALLOUTS and (os.cpu_count() or 1) > 1:
+        cards = _parse_callouts_parallel(
+            [callout for _, callout in callouts], assets_dir, keep_tags, available_files
+        )
+    else:
+        cards = [
+            parse_callout(callout, assets_dir, keep_tags, available_files)
+            for _, callout in callouts
+        ]
 
-def _process_details_subdeck(
-    details: Tag,
-    subdecks: Dict[str, List[NotionCard]],
-    assets_dir: str,
-    keep_tags: bool,
-) -> None:
-    """Process a details element as a subdeck."""
-    summary = details.find("summary")
-    if not summary:
-        return
-
-    subdeck_name = summary.get_text(strip=True)
-    if subdeck_name not in subdecks:
-        subdecks[subdeck_name] = []
-
-    # Find all callouts within this detail's indented section
-    indented = details.find("div", class_="indented")
-    if not indented:
-        return
-
-    callouts = indented.find_all("figure", class_="callout", recursive=False)
-    for callout in callouts:
-        card = parse_callout(callout, assets_dir, keep_tags)
+    for (subdeck_name, _), card in zip(callouts, cards):
         if card:
             subdecks[subdeck_name].append(card)
 
+    return deck_name, subdecks, css
 
-def _process_standalone_callout(
-    callout: Tag,
-    subdecks: Dict[str, List[NotionCard]],
-    assets_dir: str,
-    keep_tags: bool,
-) -> None:
-    """Process a callout outside of details as Default subdeck."""
-    if DEFAULT_SUBDECK_NAME not in subdecks:
-        subdecks[DEFAULT_SUBDECK_NAME] = []
 
-    card = parse_callout(callout, assets_dir, keep_tags)
-    if card:
-        subdecks[DEFAULT_SUBDECK_NAME].append(card)
+def _collect_callouts(
+    page_body: Tag, subdecks: Dict[str, List[NotionCard]]
+) -> List[Tuple[str, Tag]]:
+    """
+    Find all card callouts in a single pass over the page body.
+
+    Only direct children of the page body and of each subdeck's indented
+    section are visited. Registers every subdeck in subdecks, in page
+    order, and returns the callouts paired with their subdeck name.
+    """
+    callouts: List[Tuple[str, Tag]] = []
+
+    for element in page_body.children:
+        if not isinstance(element, Tag):
+            continue
+
+        if element.name == "figure" and "callout" in element.get("class", []):
+            # Callout outside of details goes to the Default subdeck
+            if DEFAULT_SUBDECK_NAME not in subdecks:
+                subdecks[DEFAULT_SUBDECK_NAME] = []
+            callouts.append((DEFAULT_SUBDECK_NAME, element))
+            continue
+
+        if element.name != "details":
+            continue
+
+        # Details element as a subdeck
+        summary = element.find("summary")
+        if not summary:
+            continue
+
+        subdeck_name = summary.get_text(strip=True)
+        if subdeck_name not in subdecks:
+            subdecks[subdeck_name] = []
+
+        # Callouts within this detail's indented section
+        indented = element.find("div", class_="indented")
+        if not indented:
+            continue
+
+        for child in indented.children:
+            if (
+                isinstance(child, Tag)
+                and child.name == "figure"
+                and "callout" in child.get("class", [])
+            ):
+                callouts.append((subdeck_name, child))
+
+    return callouts
+
+
+def _parse_callout_html(
+    callout_html: str, assets_dir: str, keep_tags: bool, available_files: Set[str]
+) -> Optional[NotionCard]:
+    """Parse a serialized callout, run in worker processes."""
+    callout = BeautifulSoup(callout_html, "lxml").find("figure")
+    return parse_callout(callout, assets_dir, keep_tags, available_files)
+
+
+def _parse_callouts_parallel(
+    callouts: List[Tag], assets_dir: str, keep_tags: bool, available_files: Set[str]
+) -> List[Optional[NotionCard]]:
+    """
+    Parse callouts into cards using a process pool.
+
+    Callouts are sent to the workers as HTML and re-parsed there, the
+    resulting cards are returned in the same order as callouts.
+    """
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(callouts) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _parse_callout_html,
+                [str(callout) for callout in callouts],
+                repeat(assets_dir),
+                repeat(keep_tags),
+                repeat(available_files),
+                chunksize=chunksize,
+            )
+        )
+
+
+def dedupe_media_files(media_files: List[str]) -> Dict[str, str]:
+    """
+    Find media files with identical content.
+
+    Only files of the same size are read and hashed, so unique files cost
+    a single stat.
+
+    Args:
+        media_files: Paths to media files
+
+    Returns:
+        Dictionary mapping each path to the first path with the same content
+    """
+    canonical = {path: path for path in media_files}
+
+    by_size: Dict[int, List[str]] = {}
+    for path in media_files:
+        by_size.setdefault(os.path.getsize(path), []).append(path)
+
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+
+        by_digest: Dict[bytes, str] = {}
+        for path in paths:
+            digest = hashlib.blake2b()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    digest.update(chunk)
+            canonical[path] = by_digest.setdefault(digest.digest(), path)
+
+    return canonical
+
+
+def rename_media_references(html_text: str, renames: Dict[str, str]) -> str:
+    """
+    Point image sources and sound tags at different media file names.
+
+    Args:
+        html_text: Card HTML
+        renames: Dictionary of old to new media file names
+
+    Returns:
+        HTML with the media references renamed
+    """
+    escaped_renames = {
+        escape(old_name, quote=False): escape(new_name, quote=False)
+        for old_name, new_name in renames.items()
+        if old_name != new_name
+    }
+    if not escaped_renames:
+        return html_text
+
+    # Replace all names in one pass so renames can't chain into each other
+    names = "|".join(re.escape(name) for name in escaped_renames)
+    pattern = re.compile(rf'src="({names})"|\[sound:({names})\]')
+
+    def replace(match: "re.Match[str]") -> str:
+        if match.group(1) is not None:
+            return f'src="{escaped_renames[match.group(1)]}"'
+        return f"[sound:{escaped_renames[match.group(2)]}]"
+
+    return pattern.sub(replace, html_text)
+
+
+def unique_media_names(media_files: List[str]) -> Dict[str, str]:
+    """
+    Choose a distinct file name for every media file in a package.
+
+    Anki stores media by file name only, so files from different inputs
+    that share a name (e.g. Notion's image.png) would overwrite each other.
+    The first file keeps its name, later ones get a numbered suffix.
+
+    Args:
+        media_files: Paths to distinct media files
+
+    Returns:
+        Dictionary mapping each path to the file name to store it under
+    """
+    taken = {os.path.basename(path) for path in media_files}
+    names: Dict[str, str] = {}
+    kept: Set[str] = set()
+
+    for path in media_files:
+        name = os.path.basename(path)
+        if name in kept:
+            stem, ext = os.path.splitext(name)
+            suffix = 1
+            while f"{stem}_{suffix}{ext}" in taken:
+                suffix += 1
+            name = f"{stem}_{suffix}{ext}"
+            taken.add(name)
+
+        names[path] = name
+        kept.add(name)
+
+    return names
 
 
 def export_csv(
@@ -399,15 +652,32 @@ def export_csv(
         subdecks: Dictionary of subdeck names to lists of cards
         out_path: Output CSV file path
     """
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
+    export_decks_csv({deck_name: subdecks}, out_path)
+
+
+def export_decks_csv(
+    decks: Dict[str, Dict[str, List[NotionCard]]], out_path: str
+) -> None:
+    """
+    Export several decks to a single CSV file for inspection.
+
+    Args:
+        decks: Dictionary of deck names to their subdecks
+        out_path: Output CSV file path
+    """
+    # Large buffer, Back HTML can make rows several kilobytes long
+    with open(
+        out_path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE
+    ) as f:
         writer = csv.writer(f)
         writer.writerow(["Deck", "Subdeck", "Front", "Back", "Tags"])
 
-        for subdeck_name, cards in subdecks.items():
-            for card in cards:
-                front, back, tags, _ = card.to_tuple()
-                tags_str = ", ".join(tags)
-                writer.writerow([deck_name, subdeck_name, front, back, tags_str])
+        for deck_name, subdecks in decks.items():
+            for subdeck_name, cards in subdecks.items():
+                for card in cards:
+                    front, back, tags, _ = card.to_tuple()
+                    tags_str = ", ".join(tags)
+                    writer.writerow([deck_name, subdeck_name, front, back, tags_str])
 
     print(f"✅ Wrote CSV: {out_path}")
 
@@ -424,8 +694,22 @@ def export_apkg(
         out_path: Output .apkg file path
         css: CSS styling from Notion export
     """
+    export_decks_apkg({deck_name: subdecks}, out_path, css=css)
+
+
+def export_decks_apkg(
+    decks: Dict[str, Dict[str, List[NotionCard]]], out_path: str, css: str = ""
+) -> None:
+    """
+    Export several decks to a single Anki package (.apkg).
+
+    Args:
+        decks: Dictionary of deck names to their subdecks
+        out_path: Output .apkg file path
+        css: CSS styling from Notion export
+    """
     # Combine Notion CSS with custom card styling
-    card_css = css + "\n" + CARD_STYLE_CSS
+    card_css = css + "\n" + load_card_style_css()
 
     # Create Anki model with custom styling
     model = genanki.Model(
@@ -443,40 +727,70 @@ def export_apkg(
     )
 
     all_decks: List[genanki.Deck] = []
-    all_media: List[str] = []
+    all_media: Dict[str, None] = {}  # Ordered set of media paths
     total_cards = 0
+    total_subdecks = 0
 
-    # Create decks and add cards
-    for subdeck_name, cards in subdecks.items():
-        # Build full deck name with subdeck hierarchy
-        full_deck_name = (
-            f"{deck_name}::{subdeck_name}"
-            if subdeck_name != DEFAULT_SUBDECK_NAME
-            else deck_name
-        )
-
-        # Generate unique deck ID from name
-        deck_id = abs(hash(full_deck_name)) % (10**10)
-        deck = genanki.Deck(deck_id, full_deck_name)
+    # Store identical media files only once
+    for subdecks in decks.values():
+        for cards in subdecks.values():
+            for card in cards:
+                all_media.update(dict.fromkeys(card.media_files))
+    canonical_media = dedupe_media_files(list(all_media))
 
-        # Add cards to deck
-        for card in cards:
-            front, back, tags, media_files = card.to_tuple()
-            note = genanki.Note(model=model, fields=[front, back], tags=tags)
-            deck.add_note(note)
-            all_media.extend(media_files)
-            total_cards += 1
+    # Give files that share a name (e.g. from different inputs) distinct names
+    media_names = unique_media_names(list(dict.fromkeys(canonical_media.values())))
 
-        all_decks.append(deck)
+    # Create decks and add cards
+    for deck_name, subdecks in decks.items():
+        for subdeck_name, cards in subdecks.items():
+            # Build full deck name with subdeck hierarchy
+            full_deck_name = (
+                f"{deck_name}::{subdeck_name}"
+                if subdeck_name != DEFAULT_SUBDECK_NAME
+                else deck_name
+            )
+
+            # Generate deck ID from name, stable across runs so re-imports
+            # update the existing deck instead of creating a new one
+            deck_digest = hashlib.blake2b(
+                full_deck_name.encode("utf-8"), digest_size=8
+            ).digest()
+            deck_id = int.from_bytes(deck_digest, "big") % (1 << 31)
+            deck = genanki.Deck(deck_id, full_deck_name)
+
+            # Add cards to deck
+            for card in cards:
+                front, back, tags, media_files = card.to_tuple()
+                renames = {
+                    os.path.basename(path): media_names[canonical_media[path]]
+                    for path in media_files
+                }
+                back = rename_media_references(back, renames)
+                note = genanki.Note(model=model, fields=[front, back], tags=tags)
+                deck.add_note(note)
+                total_cards += 1
+
+            all_decks.append(deck)
+            total_subdecks += 1
 
     # Create and write package
     pkg = genanki.Package(all_decks)
-    pkg.media_files = list(set(all_media))  # Remove duplicates
-    pkg.write_to_file(out_path)
+    with tempfile.TemporaryDirectory() as renamed_dir:
+        # genanki stores media under their file name, so copy renamed files
+        pkg.media_files = []
+        for path, name in media_names.items():
+            if name != os.path.basename(path):
+                renamed_path = os.path.join(renamed_dir, name)
+                shutil.copyfile(path, renamed_path)
+                path = renamed_path
+            pkg.media_files.append(path)
+
+        pkg.write_to_file(out_path)
 
     print(
         f"✅ Wrote Anki package: {out_path} "
-        f"({total_cards} cards, {len(subdecks)} subdeck(s), "
+        f"({total_cards} cards, {total_subdecks} subdeck(s), "
         f"{len(pkg.media_files)} media files)"
     )
 
@@ -489,8 +803,13 @@ def main() -> None:
     parser.add_argument(
         "-f",
         "--file",
+        dest="files",
+        action="append",
         required=True,
-        help="Input ZIP file, HTML file, or Notion hosted page URL",
+        help=(
+            "Input ZIP file, HTML file, or Notion hosted page URL "
+            "(repeat to combine several inputs into one output)"
+        ),
     )
     parser.add_argument(
         "-o", "--output", required=True, help="Output .apkg or .csv file"
@@ -509,45 +828,65 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    temp_dir = None
+    temp_dirs: List[str] = []
+    renderer = None
+    decks: Dict[str, Dict[str, List[NotionCard]]] = {}
+    css_parts: List[str] = []
     try:
-        # Determine input type and process accordingly
-        if args.file.startswith("http://") or args.file.startswith("https://"):
-            # URL - download Notion hosted page
-            if not NOTION_DOWNLOAD_AVAILABLE:
-                raise SystemExit(
-                    "❌ URL download not available.\n"
-                    "Please ensure download_notion_page.py is in the same directory.\n"
-                    "Also install Selenium: pip install selenium"
+        for input_file in args.files:
+            # Determine input type and process accordingly
+            if input_file.startswith("http://") or input_file.startswith("https://"):
+                # URL - download Notion hosted page
+                if not NOTION_DOWNLOAD_AVAILABLE:
+                    raise SystemExit(
+                        "❌ URL download not available.\n"
+                        "Please ensure download_notion_page.py is in the same directory.\n"
+                        "Also install Selenium and aiohttp: pip install selenium aiohttp"
+                    )
+                # Share one browser session between all URLs
+                if renderer is None:
+                    renderer = NotionRenderer()
+                temp_dir = tempfile.mkdtemp()
+                temp_dirs.append(temp_dir)
+                html_file, assets_dir = download_notion_page(
+                    input_file, temp_dir, renderer=renderer
                 )
-            temp_dir = tempfile.mkdtemp()
-            html_file, assets_dir = download_notion_page(args.file, temp_dir)
-        elif args.file.endswith(".zip"):
-            # ZIP file - extract it
-            temp_dir = tempfile.mkdtemp()
-            html_file, assets_dir = extract_zip_file(args.file, temp_dir)
-            print(f"📦 Extracted ZIP to: {temp_dir}")
-            print(f"📄 Found HTML: {os.path.basename(html_file)}")
-        else:
-            # Direct HTML file
-            html_file = args.file
-            assets_dir = os.path.dirname(html_file)
-
-        # Parse Notion HTML
-        deck_name, subdecks, css = parse_html_file(
-            html_file, assets_dir, keep_tags=args.keep_tags
-        )
+            elif input_file.endswith(".zip"):
+                # ZIP file - extract it
+                temp_dir = tempfile.mkdtemp()
+                temp_dirs.append(temp_dir)
+                html_file, assets_dir = extract_zip_file(input_file, temp_dir)
+                print(f"📦 Extracted ZIP to: {temp_dir}")
+                print(f"📄 Found HTML: {os.path.basename(html_file)}")
+            else:
+                # Direct HTML file
+                html_file = input_file
+                assets_dir = os.path.dirname(html_file)
+
+            # Parse Notion HTML
+            deck_name, subdecks, css = parse_html_file(
+                html_file, assets_dir, keep_tags=args.keep_tags
+            )
+
+            # Merge into decks from previous inputs
+            deck_subdecks = decks.setdefault(deck_name, {})
+            for subdeck_name, cards in subdecks.items():
+                deck_subdecks.setdefault(subdeck_name, []).extend(cards)
+            if css and css not in css_parts:
+                css_parts.append(css)
 
         # Validate cards were found
-        total_cards = sum(len(cards) for cards in subdecks.values())
+        total_cards = sum(
+            len(cards) for subdecks in decks.values() for cards in subdecks.values()
+        )
         if total_cards == 0:
             raise SystemExit("❌ No cards found in HTML file")
 
         # Export based on output format
         if args.output.endswith(".csv"):
-            export_csv(deck_name, subdecks, args.output)
+            export_decks_csv(decks, args.output)
         elif args.output.endswith(".apkg"):
-            export_apkg(deck_name, subdecks, args.output, css=css)
+            export_decks_apkg(decks, args.output, css="\n".join(css_parts))
         else:
             raise SystemExit("❌ Output must end with .csv or .apkg")
 
@@ -555,9 +894,17 @@ def main() -> None:
         print(f"❌ Error: {e}")
         raise
     finally:
-        # Clean up temporary directory
-        if temp_dir and os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+        # Shut down the shared browser session
+        if renderer is not None:
+            renderer.close()
+
+        # Clean up temporary directories
+        cleaned_up = False
+        for temp_dir in temp_dirs:
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir)
+                cleaned_up = True
+        if cleaned_up:
             print(f"🧹 Cleaned up temporary files")
 
 